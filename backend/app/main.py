@@ -1,15 +1,26 @@
+import asyncio
+import atexit
 import os
+import socket
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import FileResponse
-from pydantic import BaseModel, Field
-from redis import Redis
+import orjson
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+from typing import Annotated
+from pydantic import BaseModel, Field, StringConstraints
+from redis import ConnectionPool, Redis
 from rq import Queue
-from app.db import init_db, SessionLocal
-from app.models import Job, Artifact
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+from app.db import init_db, warm_pool, AsyncSessionLocal
+from app.models import Job
+from app.responses import ArtifactFileResponse
 from app.tasks import build_ownership
 
-app = FastAPI(title="Ownership Chain MVP")
+app = FastAPI(title="Ownership Chain MVP", default_response_class=ORJSONResponse)
 
 
 class OwnershipRequest(BaseModel):
@@ -17,45 +28,120 @@ class OwnershipRequest(BaseModel):
     depth: int = Field(3, ge=1, le=6)
 
 
+class BulkOwnershipRequest(BaseModel):
+    sirens: list[Annotated[str, StringConstraints(min_length=9, max_length=9)]] = Field(
+        ..., min_length=1, max_length=500
+    )
+    depth: int = Field(3, ge=1, le=6)
+
+
 @app.on_event("startup")
 def on_startup() -> None:
     init_db()
+    warm_pool()
+
+
+# One Redis connection pool + Queue for the process: enqueueing reuses
+# sockets instead of paying a TCP+auth handshake per request.
+_REDIS_URL = os.getenv("REDIS_URL")
+_redis_pool = (
+    ConnectionPool.from_url(
+        _REDIS_URL,
+        max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "32")),
+        client_name=os.getenv("DYNO", socket.gethostname()),
+    )
+    if _REDIS_URL
+    else None
+)
+_QUEUE = (
+    Queue("ownership", connection=Redis(connection_pool=_redis_pool))
+    if _redis_pool
+    else None
+)
 
 
 def _queue() -> Queue | None:
-    redis_url = os.getenv("REDIS_URL")
-    if not redis_url:
-        return None
-    redis_conn = Redis.from_url(redis_url)
-    return Queue("ownership", connection=redis_conn)
+    return _QUEUE
+
+
+# In-process pool for environments without Redis: jobs run in the background
+# and the POST returns immediately instead of blocking on the full pipeline.
+_POOL = ThreadPoolExecutor(max_workers=int(os.getenv("WORKERS", "4")))
+atexit.register(_POOL.shutdown)
 
 
 @app.post("/ownership")
-def create_ownership(req: OwnershipRequest):
-    session = SessionLocal()
-    try:
+async def create_ownership(req: OwnershipRequest):
+    async with AsyncSessionLocal() as session:
         job = Job(siren=req.siren, depth=req.depth, status="queued")
         session.add(job)
-        session.commit()
+        await session.commit()
 
         q = _queue()
         if q:
-            q.enqueue(build_ownership, job.id)
+            # Redis I/O is synchronous; keep it off the event loop.
+            await asyncio.to_thread(q.enqueue, build_ownership, job.id)
             return {"job_id": job.id, "status": job.status}
 
-        # Synchronous fallback for environments without Redis (e.g., Render free tier).
-        build_ownership(job.id)
-        session.refresh(job)
+        # Fallback for environments without Redis (e.g., Render free tier):
+        # hand the job to the in-process pool and answer right away.
+        _POOL.submit(build_ownership, job.id)
         return {"job_id": job.id, "status": job.status}
-    finally:
-        session.close()
+
+
+@app.post("/ownership/bulk")
+async def create_ownership_bulk(req: BulkOwnershipRequest):
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "siren": siren,
+            "depth": req.depth,
+            "status": "queued",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for siren in req.sirens
+    ]
+    async with AsyncSessionLocal() as session:
+        # One multi-row INSERT instead of a flush per job.
+        await session.execute(insert(Job), rows)
+        await session.commit()
+
+    job_ids = [row["id"] for row in rows]
+    q = _queue()
+    if q:
+
+        def _enqueue_batch() -> None:
+            # One pipelined round-trip to Redis for the whole batch, run in a
+            # thread because the Redis client is synchronous.
+            with q.connection.pipeline(transaction=False) as pipe:
+                q.enqueue_many(
+                    [Queue.prepare_data(build_ownership, (jid,)) for jid in job_ids],
+                    pipeline=pipe,
+                )
+                pipe.execute()
+
+        await asyncio.to_thread(_enqueue_batch)
+    else:
+        for jid in job_ids:
+            _POOL.submit(build_ownership, jid)
+
+    return {"job_ids": job_ids, "status": "queued"}
 
 
 @app.get("/ownership/{job_id}")
-def get_ownership(job_id: str, request: Request):
-    session = SessionLocal()
-    try:
-        job = session.query(Job).filter(Job.id == job_id).first()
+async def get_ownership(job_id: uuid.UUID, request: Request):
+    async with AsyncSessionLocal() as session:
+        # Artifacts are loaded alongside the job instead of via a second
+        # handler-issued query.
+        job = (
+            await session.execute(
+                select(Job)
+                .options(selectinload(Job.artifacts))
+                .where(Job.id == job_id)
+            )
+        ).scalar_one_or_none()
         if not job:
             # Fallback: if artifacts exist on disk, return them even if DB row is missing.
             artifacts = []
@@ -92,7 +178,6 @@ def get_ownership(job_id: str, request: Request):
                 }
             raise HTTPException(status_code=404, detail="job not found")
 
-        artifacts = session.query(Artifact).filter(Artifact.job_id == job.id).all()
         return {
             "job_id": job.id,
             "siren": job.siren,
@@ -103,20 +188,30 @@ def get_ownership(job_id: str, request: Request):
             "result": job.result_json,
             "artifacts": [
                 {"kind": a.kind, "path": a.path, "created_at": a.created_at.isoformat()}
-                for a in artifacts
+                for a in job.artifacts
             ],
         }
-    finally:
-        session.close()
+
+
+# Liveness probes hit /health constantly; rebuild the body at most once per
+# second instead of allocating a dict + isoformat string per request.
+_health_cache: tuple[int, bytes] = (0, b"")
 
 
 @app.get("/health")
 def health():
-    return {"status": "ok", "time": datetime.utcnow().isoformat()}
+    global _health_cache
+    now = int(time.time())
+    if _health_cache[0] != now:
+        _health_cache = (
+            now,
+            orjson.dumps({"status": "ok", "time": datetime.utcnow().isoformat()}),
+        )
+    return Response(content=_health_cache[1], media_type="application/json")
 
 
 @app.get("/artifact/{job_id}/{kind}")
-def get_artifact(job_id: str, kind: str):
+def get_artifact(job_id: uuid.UUID, kind: str, request: Request):
     if kind not in {"pdf", "graph"}:
         raise HTTPException(status_code=400, detail="invalid artifact kind")
 
@@ -131,4 +226,4 @@ def get_artifact(job_id: str, kind: str):
     if not os.path.exists(path):
         raise HTTPException(status_code=404, detail="artifact not found")
 
-    return FileResponse(path, media_type=media_type)
+    return ArtifactFileResponse(path, media_type=media_type, request=request)
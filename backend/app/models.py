@@ -1,6 +1,7 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Integer, Text, JSON, ForeignKey
+from sqlalchemy import Column, String, DateTime, Integer, Text, JSON, ForeignKey, Index, Uuid
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from app.db import Base
 
@@ -8,14 +9,17 @@ from app.db import Base
 class Job(Base):
     __tablename__ = "jobs"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    # 16-byte binary UUIDs: half the index size of the old 36-char strings.
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     siren = Column(String, index=True, nullable=False)
     depth = Column(Integer, nullable=False, default=3)
     status = Column(String, nullable=False, default="queued")
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     error = Column(Text, nullable=True)
-    result_json = Column(JSON, nullable=True)
+    # JSONB on Postgres (binary storage, no re-parse on read); plain JSON
+    # elsewhere.
+    result_json = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
 
     artifacts = relationship("Artifact", back_populates="job")
 
@@ -23,10 +27,12 @@ class Job(Base):
 class Artifact(Base):
     __tablename__ = "artifacts"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    job_id = Column(String, ForeignKey("jobs.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    job_id = Column(Uuid, ForeignKey("jobs.id"), index=True, nullable=False)
     kind = Column(String, nullable=False)  # pdf | graph
     path = Column(String, nullable=False)
+    # Hash of the render inputs; identical jobs share files via this key.
+    content_key = Column(String, index=True, nullable=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
     job = relationship("Job", back_populates="artifacts")
@@ -43,8 +49,9 @@ class Company(Base):
 
 class OwnershipLink(Base):
     __tablename__ = "ownership_links"
+    __table_args__ = (Index("ix_ol_parent_child", "parent_siren", "child_siren"),)
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     parent_siren = Column(String, nullable=False)
     child_siren = Column(String, nullable=False)
     pct = Column(String, nullable=True)
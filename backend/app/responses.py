@@ -0,0 +1,123 @@
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import Request
+from starlette.responses import Response
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class ArtifactFileResponse(Response):
+    """File response tuned for artifact downloads.
+
+    Stats the file once, emits content-length / etag / last-modified, answers
+    conditional requests with 304, honors simple single-range requests, and
+    uses the ASGI ``http.response.zerocopysend`` extension (kernel-space
+    ``sendfile``) when the server offers it, falling back to chunked reads.
+    """
+
+    def __init__(self, path: str, media_type: str, request: Request) -> None:
+        super().__init__(media_type=media_type)
+        self.path = path
+        stat = os.stat(path)
+        self.file_size = stat.st_size
+        self.etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self._not_modified = self._check_not_modified(request)
+        self._range = self._parse_range(request)
+
+    def _check_not_modified(self, request: Request) -> bool:
+        if request.headers.get("if-none-match") == self.etag:
+            return True
+        ims = request.headers.get("if-modified-since")
+        if ims:
+            try:
+                if parsedate_to_datetime(ims) >= parsedate_to_datetime(
+                    self.last_modified
+                ):
+                    return True
+            except (TypeError, ValueError):
+                pass
+        return False
+
+    def _parse_range(self, request: Request) -> tuple[int, int] | None:
+        header = request.headers.get("range", "")
+        if not header.startswith("bytes=") or "," in header:
+            return None
+        start_s, _, end_s = header[len("bytes=") :].partition("-")
+        try:
+            if start_s:
+                start = int(start_s)
+                end = int(end_s) if end_s else self.file_size - 1
+            else:
+                # Suffix range: last N bytes.
+                start = self.file_size - int(end_s)
+                end = self.file_size - 1
+        except ValueError:
+            return None
+        if start < 0 or end >= self.file_size or start > end:
+            return None
+        return start, end
+
+    async def __call__(self, scope, receive, send) -> None:
+        headers = [
+            (b"etag", self.etag.encode("latin-1")),
+            (b"last-modified", self.last_modified.encode("latin-1")),
+            (b"accept-ranges", b"bytes"),
+        ]
+        if self._not_modified:
+            await send(
+                {"type": "http.response.start", "status": 304, "headers": headers}
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if self._range:
+            status = 206
+            offset, end = self._range
+            count = end - offset + 1
+            headers.append(
+                (
+                    b"content-range",
+                    f"bytes {offset}-{end}/{self.file_size}".encode("latin-1"),
+                )
+            )
+        else:
+            status = 200
+            offset, count = 0, self.file_size
+
+        headers.append((b"content-length", str(count).encode("latin-1")))
+        headers.append((b"content-type", self.media_type.encode("latin-1")))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            fd = os.open(self.path, os.O_RDONLY)
+            await send(
+                {
+                    "type": "http.response.zerocopysend",
+                    "file": fd,
+                    "offset": offset,
+                    "count": count,
+                    "more_body": False,
+                }
+            )
+            return
+
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            remaining = count
+            while remaining > 0:
+                chunk = f.read(min(_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": remaining > 0,
+                    }
+                )
+            if remaining > 0 or count == 0:
+                # Empty file or short read: ASGI requires a final body event
+                # after http.response.start, even when there are no bytes.
+                await send({"type": "http.response.body", "body": b""})
@@ -1,37 +1,81 @@
+import functools
+import hashlib
+import io
+import multiprocessing
 import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import (
+    ChoiceLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    ModuleLoader,
+)
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 import time
 import logging
-import requests
+import httpx
+import orjson
+from redis import Redis
+from sqlalchemy import insert, update
+from sqlalchemy.orm import load_only
 from app.db import SessionLocal
 from app.models import Job, Artifact
 
+# Defined before any function that logs, so nothing can hit a NameError at
+# import time.
+logger = logging.getLogger("ownership")
+if not logger.handlers:
+    logging.basicConfig(level=logging.INFO)
+
+
+# Created once at import instead of re-stat'ing/mkdir'ing per artifact.
+_ARTIFACT_DIR = Path(os.getenv("ARTIFACT_DIR", "./data"))
+_ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+
 
 def _artifact_dir() -> Path:
-    base = os.getenv("ARTIFACT_DIR", "./data")
-    Path(base).mkdir(parents=True, exist_ok=True)
-    return Path(base)
+    return _ARTIFACT_DIR
 
 
 def _confidence_score(has_pct: bool, is_recent: bool, is_primary: bool, inferred: bool) -> int:
-    score = 0
-    if is_primary:
-        score += 40
-    if is_recent:
-        score += 20
-    if has_pct:
-        score += 20
-    if inferred:
-        score -= 20
-    score = max(0, min(100, score))
-    return score
+    # Branchless: bools coerce to 0/1, so the score is one arithmetic
+    # expression plus a clamp — called per edge once real sources land.
+    score = 40 * is_primary + 20 * is_recent + 20 * has_pct - 20 * inferred
+    return 0 if score < 0 else 100 if score > 100 else score
 
 
-_TOKEN_CACHE = {"access_token": None, "expires_at": 0}
+# Shared HTTP/2 client: keep-alive reuses TCP/TLS connections across the
+# token, Sirene, and BODACC calls, and H2 multiplexes concurrent requests
+# (the token POST plus the overlapped GETs) over one connection. The
+# transport retries connect failures; 429s are prevented by the rate
+# limiter below.
+_SESSION = httpx.Client(
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    ),
+    timeout=15,
+    headers={"Accept": "application/json", "User-Agent": "ownership-mvp/1"},
+)
+
+
+@dataclass(slots=True)
+class _TokenCache:
+    access_token: str | None = None
+    # time.monotonic() deadline — immune to wall-clock adjustments.
+    expires_at: float = 0.0
+
+
+_TOKEN_CACHE = _TokenCache()
 
 
 def _sirene_access_token() -> str | None:
@@ -46,9 +90,9 @@ def _sirene_access_token() -> str | None:
     if not client_id or not client_secret:
         return None
 
-    now = int(time.time())
-    if _TOKEN_CACHE["access_token"] and now < int(_TOKEN_CACHE["expires_at"]) - 30:
-        return _TOKEN_CACHE["access_token"]
+    now = time.monotonic()
+    if _TOKEN_CACHE.access_token and now < _TOKEN_CACHE.expires_at - 30:
+        return _TOKEN_CACHE.access_token
 
     token_url = os.getenv("SIRENE_TOKEN_URL", "https://api.insee.fr/token")
     data = {"grant_type": "client_credentials"}
@@ -56,19 +100,19 @@ def _sirene_access_token() -> str | None:
     if scope:
         data["scope"] = scope
 
-    resp = requests.post(token_url, data=data, auth=(client_id, client_secret), timeout=15)
+    resp = _SESSION.post(token_url, data=data, auth=(client_id, client_secret), timeout=15)
     if resp.status_code != 200:
         logger.warning("Sirene token fetch failed: %s %s", resp.status_code, resp.text[:200])
         return None
 
-    payload = resp.json()
+    payload = orjson.loads(resp.content)
     access_token = payload.get("access_token")
     expires_in = payload.get("expires_in", 3600)
     if not access_token:
         return None
 
-    _TOKEN_CACHE["access_token"] = access_token
-    _TOKEN_CACHE["expires_at"] = now + int(expires_in)
+    _TOKEN_CACHE.access_token = access_token
+    _TOKEN_CACHE.expires_at = now + int(expires_in)
     return access_token
 
 
@@ -88,17 +132,151 @@ def _sirene_headers() -> dict:
     return {"Authorization": f"Bearer {token}"}
 
 
+_REDIS: Redis | None = None
+
+
+def _redis_conn() -> Redis | None:
+    # Same Redis instance RQ already uses; absent REDIS_URL disables caching.
+    global _REDIS
+    if _REDIS is None and os.getenv("REDIS_URL"):
+        _REDIS = Redis.from_url(os.getenv("REDIS_URL"))
+    return _REDIS
+
+
+def _redis_cached(prefix: str, ttl: int = 86400, negative_ttl: int = 300):
+    """Cache a fetcher's JSON result in Redis keyed by its first argument.
+
+    Sirene/BODACC data changes on the order of days, so hits skip the HTTP
+    round-trip entirely. Empty results get a short negative TTL so an
+    upstream outage doesn't get hammered, and absent REDIS_URL disables
+    caching.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(key_arg, *args, **kwargs):
+            conn = _redis_conn()
+            key = f"{prefix}:{key_arg}"
+            if conn:
+                try:
+                    cached = conn.get(key)
+                    if cached is not None:
+                        return orjson.loads(cached)
+                except Exception as exc:
+                    logger.warning("Cache read failed for %s: %s", key, exc)
+            result = func(key_arg, *args, **kwargs)
+            if conn:
+                try:
+                    conn.set(key, orjson.dumps(result), ex=ttl if result else negative_ttl)
+                except Exception as exc:
+                    logger.warning("Cache write failed for %s: %s", key, exc)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _sirene_rate_limit() -> None:
+    """Block until a Sirene request slot is free.
+
+    INSEE enforces per-minute quotas and can block overrunning callers for
+    a long time, so a shared INCR+EXPIRE window in Redis throttles all
+    workers together. Without Redis this is a no-op.
+    """
+    conn = _redis_conn()
+    limit = int(os.getenv("SIRENE_RATE_LIMIT", "30"))
+    if not conn or limit <= 0:
+        return
+    while True:
+        window = int(time.time()) // 60
+        try:
+            count = conn.incr(f"sirene:rl:{window}")
+            if count == 1:
+                conn.expire(f"sirene:rl:{window}", 120)
+            if count <= limit:
+                return
+        except Exception as exc:
+            logger.warning("Sirene rate limiter unavailable: %s", exc)
+            return
+        # Window exhausted: sleep until the next minute starts.
+        time.sleep(60 - time.time() % 60 + 0.05)
+
+
+def _sirene_cache_key(path: str, params: dict | None) -> str:
+    raw = f"{path}|{sorted((params or {}).items())}".encode()
+    return "sirene:" + hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
 def _sirene_get(path: str, params: dict | None = None) -> dict | None:
     base = os.getenv("SIRENE_BASE_URL", "https://api.insee.fr/api-sirene/3.11")
     url = f"{base}{path}"
+
+    conn = _redis_conn()
+    key = _sirene_cache_key(path, params)
+    if conn:
+        try:
+            cached = conn.get(key)
+            if cached:
+                return orjson.loads(cached)
+        except Exception as exc:
+            logger.warning("Sirene cache read failed: %s", exc)
+
     headers = _sirene_headers()
     if not headers:
         return None
-    resp = requests.get(url, headers=headers, params=params, timeout=15)
+
+    # Conditional GET: replay the last ETag so an unchanged resource comes
+    # back as a body-less 304 and we reuse the stored payload.
+    if conn:
+        try:
+            etag = conn.get(f"{key}:etag")
+            if etag:
+                headers["If-None-Match"] = etag.decode()
+        except Exception as exc:
+            logger.warning("Sirene etag read failed: %s", exc)
+
+    _sirene_rate_limit()
+    resp = _SESSION.get(url, headers=headers, params=params, timeout=15)
+    if resp.status_code == 304 and conn:
+        try:
+            body = conn.get(f"{key}:body")
+        except Exception as exc:
+            logger.warning("Sirene body read failed: %s", exc)
+            body = None
+        if body is not None:
+            try:
+                ttl = int(os.getenv("SIRENE_CACHE_TTL", "86400"))
+                conn.set(key, body, ex=ttl)
+            except Exception as exc:
+                logger.warning("Sirene cache write failed: %s", exc)
+            return orjson.loads(body)
+        # Stored body evicted: re-request unconditionally.
+        headers.pop("If-None-Match", None)
+        _sirene_rate_limit()
+        resp = _SESSION.get(url, headers=headers, params=params, timeout=15)
+
     if resp.status_code != 200:
         logger.warning("Sirene request failed: %s %s -> %s %s", url, params, resp.status_code, resp.text[:200])
         return None
-    return resp.json()
+    # Sirene /siret payloads can run to tens of KB; orjson parses bytes
+    # directly and much faster than stdlib json.
+    data = orjson.loads(resp.content)
+
+    if conn:
+        try:
+            ttl = int(os.getenv("SIRENE_CACHE_TTL", "86400"))
+            body = orjson.dumps(data)
+            conn.set(key, body, ex=ttl)
+            etag = resp.headers.get("ETag")
+            if etag:
+                # ETag + body outlive the fresh-cache TTL so revalidation
+                # still pays off after it expires.
+                conn.set(f"{key}:etag", etag, ex=7 * 86400)
+                conn.set(f"{key}:body", body, ex=7 * 86400)
+        except Exception as exc:
+            logger.warning("Sirene cache write failed: %s", exc)
+    return data
 
 
 def _format_address(addr: dict) -> str:
@@ -114,14 +292,7 @@ def _format_address(addr: dict) -> str:
     return " ".join([p for p in parts if p])
 
 
-def _get_first(fields: dict, keys: list[str]) -> str | None:
-    for key in keys:
-        value = fields.get(key)
-        if value:
-            return value
-    return None
-
-
+@_redis_cached(prefix="bodacc:events")
 def _fetch_bodacc_events(siren: str, limit: int = 5) -> list[dict]:
     base = os.getenv(
         "BODACC_BASE_URL",
@@ -135,7 +306,7 @@ def _fetch_bodacc_events(siren: str, limit: int = 5) -> list[dict]:
     }
 
     try:
-        resp = requests.get(base, params=params, timeout=20)
+        resp = _SESSION.get(base, params=params, timeout=20)
         if resp.status_code != 200:
             logger.warning(
                 "BODACC request failed: %s -> %s %s",
@@ -145,21 +316,22 @@ def _fetch_bodacc_events(siren: str, limit: int = 5) -> list[dict]:
             )
             return []
 
-        data = resp.json()
+        data = orjson.loads(resp.content)
         records = data.get("records", [])
         events = []
         for rec in records:
             fields = rec.get("fields", {})
             events.append(
+                # Inline `or` fallbacks: no helper-call frame per field.
                 {
-                    "date": _get_first(fields, ["dateparution", "date_parution"]),
-                    "type": _get_first(fields, ["typeannonce", "type_annonce"]),
-                    "categorie": _get_first(
-                        fields, ["categorieannonce", "categorie_annonce"]
-                    ),
-                    "numero": _get_first(fields, ["numeroannonce", "numero_annonce"]),
-                    "tribunal": _get_first(fields, ["tribunal"]),
-                    "ville": _get_first(fields, ["ville", "commune"]),
+                    "date": fields.get("dateparution") or fields.get("date_parution"),
+                    "type": fields.get("typeannonce") or fields.get("type_annonce"),
+                    "categorie": fields.get("categorieannonce")
+                    or fields.get("categorie_annonce"),
+                    "numero": fields.get("numeroannonce")
+                    or fields.get("numero_annonce"),
+                    "tribunal": fields.get("tribunal"),
+                    "ville": fields.get("ville") or fields.get("commune"),
                 }
             )
         return events
@@ -168,8 +340,22 @@ def _fetch_bodacc_events(siren: str, limit: int = 5) -> list[dict]:
         return []
 
 
+@_redis_cached(prefix="sirene:id")
 def _fetch_sirene_identity(siren: str) -> dict:
-    data = _sirene_get(f"/siren/{siren}", params={"date": "2999-12-31"})
+    # The /siren identity call and the siège /siret search are independent,
+    # so overlap them; the worker is a sync RQ process, so threads do the
+    # overlapping rather than an async client. Only the direct /siret lookup
+    # (which needs the NIC from the identity response) stays conditional.
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        f_identity = ex.submit(_sirene_get, f"/siren/{siren}", {"date": "2999-12-31"})
+        f_siege = ex.submit(
+            _sirene_get,
+            "/siret",
+            {"q": f"siren:{siren} AND etablissementSiege:true", "nombre": "1"},
+        )
+        data = f_identity.result()
+        siege = f_siege.result()
+
     if not data:
         return {}
 
@@ -187,26 +373,18 @@ def _fetch_sirene_identity(siren: str) -> dict:
     siret = f"{siren}{nic}" if nic else None
 
     address = ""
-    if siret:
+    etablissements = (siege or {}).get("etablissements", [])
+    if etablissements:
+        addr = etablissements[0].get("adresseEtablissement", {})
+        address = _format_address(addr)
+
+    # Fallback: direct siège lookup if the search returned nothing.
+    if not address and siret:
         siret_data = _sirene_get(f"/siret/{siret}", params={"date": "2999-12-31"})
         etab = (siret_data or {}).get("etablissement", {})
         addr = etab.get("adresseEtablissement", {})
         address = _format_address(addr)
 
-    # Fallback: search for the siège établissement if address is still empty.
-    if not address:
-        search = _sirene_get(
-            "/siret",
-            params={
-                "q": f"siren:{siren} AND etablissementSiege:true",
-                "nombre": "1",
-            },
-        )
-        etablissements = (search or {}).get("etablissements", [])
-        if etablissements:
-            addr = etablissements[0].get("adresseEtablissement", {})
-            address = _format_address(addr)
-
     return {
         "name": name,
         "status": status,
@@ -215,108 +393,312 @@ def _fetch_sirene_identity(siren: str) -> dict:
     }
 
 
+_TEMPLATES_DIR = os.getenv("TEMPLATES_DIR", "/app/templates")
+_COMPILED_DIR = "/tmp/jinja_compiled"
+_JINJA_ENV: Environment | None = None
+
+
+def precompile_templates() -> None:
+    """Ahead-of-time compile the templates to Python modules at worker boot.
+
+    Subsequent loads deserialize compiled code via ModuleLoader instead of
+    re-parsing Jinja source. Skipped for tiny template sets where the parse
+    cost doesn't justify the compile pass.
+    """
+    if not os.path.isdir(_TEMPLATES_DIR) or len(os.listdir(_TEMPLATES_DIR)) < 3:
+        return
+    Environment(loader=FileSystemLoader(_TEMPLATES_DIR)).compile_templates(
+        target=_COMPILED_DIR, zip=None
+    )
+
+
+def _jinja_env() -> Environment:
+    # Built lazily so importing the module doesn't require the templates dir,
+    # then cached: jinja2 parses/compiles each template once per process.
+    global _JINJA_ENV
+    if _JINJA_ENV is None:
+        bytecode_dir = "/tmp/jinja"
+        os.makedirs(bytecode_dir, exist_ok=True)
+        loader = FileSystemLoader(_TEMPLATES_DIR)
+        if os.path.isdir(_COMPILED_DIR):
+            # Prefer precompiled modules when the worker compiled them at boot.
+            loader = ChoiceLoader([ModuleLoader(_COMPILED_DIR), loader])
+        _JINJA_ENV = Environment(
+            loader=loader,
+            auto_reload=False,
+            cache_size=64,
+            bytecode_cache=FileSystemBytecodeCache(bytecode_dir),
+        )
+        # |tojson over thousands of nodes/edges dominates render time with
+        # the stdlib encoder; route it through orjson instead.
+        _JINJA_ENV.policies["json.dumps_function"] = (
+            lambda obj, **kw: orjson.dumps(obj).decode()
+        )
+        _JINJA_ENV.policies["json.dumps_kwargs"] = {}
+    return _JINJA_ENV
+
+
+@functools.lru_cache(maxsize=8)
+def _get_template(name: str):
+    # Skips even the environment's cache lookup on repeat renders.
+    return _jinja_env().get_template(name)
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    try:
+        if dst.exists():
+            dst.unlink()
+        os.link(src, dst)
+    except OSError:
+        # Filesystems without hardlink support fall back to a copy.
+        shutil.copyfile(src, dst)
+
+
+# Placeholder rendered into the shared content-addressed file; the real job
+# id is stamped when the per-job copy is made.
+_JOB_ID_TOKEN = "__JOB_ID__"
+
+
 def _render_graph_html(
     job_id: str, nodes: list[dict], edges: list[dict], meta: dict
 ) -> Path:
-    env = Environment(loader=FileSystemLoader("/app/templates"))
-    template = env.get_template("graph.html")
-
-    html = template.render(job_id=job_id, nodes=nodes, edges=edges, meta=meta)
     out_path = _artifact_dir() / f"graph_{job_id}.html"
-    out_path.write_text(html, encoding="utf-8")
+
+    # Content-addressed cache: identical render inputs produce identical
+    # HTML, so re-queued SIRENs skip the Jinja pass. The shared file carries
+    # a job-id placeholder so it never shows another job's id.
+    key = hashlib.blake2b(
+        orjson.dumps((nodes, edges, meta)), digest_size=16
+    ).hexdigest()
+    cached = _artifact_dir() / f"graph_{key}.html"
+    if not cached.exists():
+        template = _get_template("graph.html")
+        # Stream the render chunk-by-chunk instead of materializing the
+        # whole HTML string in memory first; a 1 MiB buffer keeps the write
+        # syscall count low.
+        with cached.open("w", encoding="utf-8", buffering=1 << 20) as f:
+            template.stream(
+                job_id=_JOB_ID_TOKEN, nodes=nodes, edges=edges, meta=meta
+            ).dump(f)
+
+    out_path.write_text(
+        cached.read_text(encoding="utf-8").replace(_JOB_ID_TOKEN, str(job_id)),
+        encoding="utf-8",
+    )
     return out_path
 
 
-def _render_pdf(job_id: str, siren: str, summary: dict, events: list[dict]) -> Path:
-    out_path = _artifact_dir() / f"report_{job_id}.pdf"
-    c = canvas.Canvas(str(out_path), pagesize=A4)
-    width, height = A4
+# Pagesize is static; resolve it once instead of per job.
+_PAGESIZE = A4
 
-    y = height - 60
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, y, "Ownership Chain Report (MVP)")
+# Static report structure, built once: per-job code only formats the dynamic
+# values. The title itself lives in the letterhead Form XObject.
+_FONT_HEADING = ("Helvetica-Bold", 12)
+_FONT_BODY = ("Helvetica", 10)
+_PROFILE_KEYS = ("Company name", "Status", "Address")
+_SUMMARY_KEYS = ("Direct shareholders found", "Missing data", "Confidence score")
 
-    y -= 40
-    c.setFont("Helvetica", 12)
-    c.drawString(50, y, f"SIREN: {siren}")
-    y -= 20
-    c.drawString(50, y, f"Job ID: {job_id}")
-    y -= 20
-    c.drawString(50, y, f"Generated at: {datetime.utcnow().isoformat()} UTC")
 
-    y -= 40
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "Company Profile")
+def _define_letterhead(c: canvas.Canvas) -> None:
+    """Register the static letterhead as a Form XObject on this document.
 
-    y -= 20
-    c.setFont("Helvetica", 10)
-    for key in ["Company name", "Status", "Address"]:
-        c.drawString(50, y, f"- {key}: {summary.get(key)}")
-        y -= 14
+    ReportLab serializes forms per document, so the form is defined once per
+    canvas and stamped with ``doForm`` on every page — the font resources and
+    title operators are emitted a single time in the output PDF.
+    """
+    width, height = _PAGESIZE
+    c.beginForm("letterhead")
+    c.saveState()
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(50, height - 60, "Ownership Chain Report (MVP)")
+    c.restoreState()
+    c.endForm()
+
+
+def _draw_lines(
+    c: canvas.Canvas,
+    x: float,
+    y: float,
+    font: str,
+    size: int,
+    lines: list[str],
+    leading: float = 14,
+) -> float:
+    """Write a block of lines through one text object and return the next y.
+
+    A single beginText/drawText pair per block emits far fewer PDF operators
+    and Python↔C calls than a drawString per line.
+    """
+    t = c.beginText(x, y)
+    t.setFont(font, size)
+    t.setLeading(leading)
+    for line in lines:
+        t.textLine(line)
+    c.drawText(t)
+    return y - leading * len(lines)
+
+
+def _render_pdf(
+    job_id: str,
+    siren: str,
+    summary: dict,
+    events: list[dict],
+    content_key: str | None = None,
+) -> Path:
+    out_path = _artifact_dir() / f"report_{job_id}.pdf"
 
-    y -= 10
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "Ownership Summary")
+    # Content-addressed: if the same upstream data was already rendered,
+    # skip the whole ReportLab pass and hardlink the existing file.
+    cached = _artifact_dir() / f"report_{content_key}.pdf" if content_key else None
+    if cached is not None and cached.exists():
+        _link_or_copy(cached, out_path)
+        return out_path
+
+    # Render into memory and flush with a single write() instead of letting
+    # ReportLab stream many small buffered writes to disk.
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=_PAGESIZE)
+    width, height = _PAGESIZE
+
+    _define_letterhead(c)
+    c.doForm("letterhead")
+    y = height - 100
+
+    # A content-keyed file is shared by every job with the same data, so it
+    # may only contain content-stable fields — per-job identity lives in the
+    # filename and the API response. Job id and timestamp appear only in
+    # non-deduplicated renders.
+    meta_lines = [f"SIREN: {siren}"]
+    if content_key:
+        meta_lines.append(f"Report key: {content_key}")
+    else:
+        meta_lines.append(f"Job ID: {job_id}")
+        meta_lines.append(f"Generated at: {datetime.utcnow().isoformat()} UTC")
+    y = _draw_lines(c, 50, y, "Helvetica", 12, meta_lines, leading=20)
 
     y -= 20
-    c.setFont("Helvetica", 10)
-    for key in ["Direct shareholders found", "Missing data", "Confidence score"]:
-        c.drawString(50, y, f"- {key}: {summary.get(key)}")
-        y -= 14
+    y = _draw_lines(c, 50, y, *_FONT_HEADING, ["Company Profile"], leading=20)
+    y = _draw_lines(
+        c,
+        50,
+        y,
+        *_FONT_BODY,
+        [f"- {key}: {summary.get(key)}" for key in _PROFILE_KEYS],
+    )
 
     y -= 10
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "BODACC Events (latest)")
+    y = _draw_lines(c, 50, y, *_FONT_HEADING, ["Ownership Summary"], leading=20)
+    y = _draw_lines(
+        c,
+        50,
+        y,
+        *_FONT_BODY,
+        [f"- {key}: {summary.get(key)}" for key in _SUMMARY_KEYS],
+    )
+
+    y -= 10
+    y = _draw_lines(c, 50, y, *_FONT_HEADING, ["BODACC Events (latest)"], leading=20)
 
-    y -= 20
-    c.setFont("Helvetica", 10)
     if events:
+        # Accumulate lines and flush one text object per page.
+        page_lines: list[str] = []
         for e in events:
-            line = f"- {e.get('date') or 'N/A'} | {e.get('type') or 'Event'} | {e.get('categorie') or ''}"
-            c.drawString(50, y, line)
-            y -= 14
-            if y < 80:
+            page_lines.append(
+                f"- {e.get('date') or 'N/A'} | {e.get('type') or 'Event'} | {e.get('categorie') or ''}"
+            )
+            if y - 14 * len(page_lines) < 80:
+                y = _draw_lines(c, 50, y, *_FONT_BODY, page_lines)
+                page_lines = []
                 c.showPage()
-                y = height - 60
+                c.doForm("letterhead")
+                y = height - 100
+        if page_lines:
+            y = _draw_lines(c, 50, y, *_FONT_BODY, page_lines)
     else:
-        c.drawString(50, y, "- No events found")
-        y -= 14
+        y = _draw_lines(c, 50, y, *_FONT_BODY, ["- No events found"])
 
     y -= 10
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "Sources & Limits")
-
-    y -= 20
-    c.setFont("Helvetica", 10)
-    c.drawString(50, y, f"- {summary.get('Sources')}")
-    y -= 14
+    y = _draw_lines(c, 50, y, *_FONT_HEADING, ["Sources & Limits"], leading=20)
+    y = _draw_lines(c, 50, y, *_FONT_BODY, [f"- {summary.get('Sources')}"])
 
     c.showPage()
     c.save()
+
+    data = buf.getvalue()
+    target = cached if cached is not None else out_path
+    fd = os.open(str(target), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(fd, 0, len(data))
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    if cached is not None:
+        _link_or_copy(cached, out_path)
     return out_path
 
 
-def build_ownership(job_id: str) -> None:
+# ReportLab rendering is CPU-bound Python; a process pool shared across jobs
+# sidesteps the GIL and lets both artifacts (and concurrent jobs) render in
+# parallel. Built lazily so it only exists in processes that run jobs.
+_RENDER_POOL: ProcessPoolExecutor | None = None
+_RENDER_POOL_LOCK = threading.Lock()
+
+
+def _render_pool() -> ProcessPoolExecutor:
+    global _RENDER_POOL
+    with _RENDER_POOL_LOCK:
+        if _RENDER_POOL is None:
+            # Spawn instead of fork: in the no-Redis fallback this pool is
+            # created from the multi-threaded API process, where forking can
+            # deadlock on locks held by other threads.
+            _RENDER_POOL = ProcessPoolExecutor(
+                max_workers=int(os.getenv("RENDER_WORKERS", str(os.cpu_count() or 2))),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+    return _RENDER_POOL
+
+
+def build_ownership(job_id) -> None:
+    # Phase 1: a short session just to read the job (and optionally publish
+    # "running"), released before the slow fetch/render work so the pooled
+    # connection isn't held for hundreds of milliseconds.
     session = SessionLocal()
     try:
-        job = session.query(Job).filter(Job.id == job_id).first()
+        # Only the columns the pipeline needs; skips result_json etc.
+        job = session.get(
+            Job, job_id, options=[load_only(Job.siren, Job.depth, Job.status)]
+        )
         if not job:
             return
+        siren, depth = job.siren, job.depth
+        if os.getenv("JOB_STATUS_EAGER", "0") == "1":
+            # Fire-and-forget heartbeat: one UPDATE, no ORM flush cycle.
+            session.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(status="running", updated_at=datetime.utcnow())
+            )
+            session.commit()
+    finally:
+        session.close()
 
-        job.status = "running"
-        job.updated_at = datetime.utcnow()
-        session.commit()
-
-        identity = _fetch_sirene_identity(job.siren)
-        bodacc_events = _fetch_bodacc_events(job.siren, limit=5)
-        company_name = identity.get("name") or f"Company {job.siren}"
+    try:
+        # Phase 2: external fetches and artifact rendering, no DB connection
+        # held. Sirene and BODACC are independent, so overlap them.
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            f_identity = ex.submit(_fetch_sirene_identity, siren)
+            f_bodacc = ex.submit(_fetch_bodacc_events, siren, 5)
+            identity = f_identity.result()
+            bodacc_events = f_bodacc.result()
+        company_name = identity.get("name") or f"Company {siren}"
         company_status = identity.get("status") or "Unknown"
         company_address = identity.get("address") or "Unknown"
 
         # Placeholder data for ownership until sources are wired
         nodes = [
             {
-                "id": job.siren,
+                "id": siren,
                 "label": company_name,
                 "group": "target",
                 "title": f"Status: {company_status}<br/>Address: {company_address}",
@@ -324,7 +706,7 @@ def build_ownership(job_id: str) -> None:
             {"id": "UNKNOWN", "label": "Actionnaire non public", "group": "unknown"},
         ]
         edges = [
-            {"from": "UNKNOWN", "to": job.siren, "label": "N/A", "confidence": 20}
+            {"from": "UNKNOWN", "to": siren, "label": "N/A", "confidence": 20}
         ]
 
         confidence = _confidence_score(has_pct=False, is_recent=False, is_primary=False, inferred=True)
@@ -340,44 +722,84 @@ def build_ownership(job_id: str) -> None:
             "Sources": "Sirene (identity + siège address), BODACC (events); ownership not public",
         }
 
-        graph_path = _render_graph_html(
-            job.id,
+        # One key over all upstream data: re-queued SIRENs with unchanged
+        # inputs reuse the existing files instead of re-rendering.
+        content_key = hashlib.blake2b(
+            orjson.dumps(
+                {"identity": identity, "bodacc": bodacc_events, "summary": summary}
+            ),
+            digest_size=16,
+        ).hexdigest()
+
+        pool = _render_pool()
+        f_graph = pool.submit(
+            _render_graph_html,
+            job_id,
             nodes,
             edges,
-            meta={
-                "siren": job.siren,
+            {
+                "siren": siren,
                 "name": company_name,
                 "status": company_status,
                 "address": company_address,
                 "bodacc_events": bodacc_events,
             },
         )
-        pdf_path = _render_pdf(job.id, job.siren, summary, bodacc_events)
-
-        session.add(Artifact(job_id=job.id, kind="graph", path=str(graph_path)))
-        session.add(Artifact(job_id=job.id, kind="pdf", path=str(pdf_path)))
-
-        job.status = "done"
-        job.result_json = {
-            "siren": job.siren,
-            "depth": job.depth,
-            "nodes": nodes,
-            "edges": edges,
-            "summary": summary,
-            "bodacc_events": bodacc_events,
-        }
-        job.updated_at = datetime.utcnow()
-        session.commit()
+        f_pdf = pool.submit(
+            _render_pdf, job_id, siren, summary, bodacc_events, content_key
+        )
+        graph_path = f_graph.result()
+        pdf_path = f_pdf.result()
+
+        # Phase 3: reacquire a session only for the final writes — artifact
+        # rows plus the terminal status in a single commit.
+        session = SessionLocal()
+        try:
+            # One multi-row INSERT, skipping the ORM flush machinery.
+            session.execute(
+                insert(Artifact),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "job_id": job_id,
+                        "kind": "graph",
+                        "path": str(graph_path),
+                        "content_key": content_key,
+                    },
+                    {
+                        "id": uuid.uuid4(),
+                        "job_id": job_id,
+                        "kind": "pdf",
+                        "path": str(pdf_path),
+                        "content_key": content_key,
+                    },
+                ],
+            )
+
+            job = session.get(Job, job_id)
+            if job:
+                job.status = "done"
+                job.result_json = {
+                    "siren": siren,
+                    "depth": depth,
+                    "nodes": nodes,
+                    "edges": edges,
+                    "summary": summary,
+                    "bodacc_events": bodacc_events,
+                }
+                job.updated_at = datetime.utcnow()
+            session.commit()
+        finally:
+            session.close()
     except Exception as exc:
-        session.rollback()
-        job = session.query(Job).filter(Job.id == job_id).first()
-        if job:
-            job.status = "error"
-            job.error = str(exc)
-            job.updated_at = datetime.utcnow()
+        # One UPDATE, no SELECT: a missing row simply matches nothing.
+        session = SessionLocal()
+        try:
+            session.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(status="error", error=str(exc), updated_at=datetime.utcnow())
+            )
             session.commit()
-    finally:
-        session.close()
-logger = logging.getLogger("ownership")
-if not logger.handlers:
-    logging.basicConfig(level=logging.INFO)
+        finally:
+            session.close()
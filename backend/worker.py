@@ -1,14 +1,33 @@
 import os
 from redis import Redis
-from rq import Worker, Queue, Connection
+from rq import Queue, SimpleWorker
+from rq.worker_pool import WorkerPool
+from app.tasks import precompile_templates
 
 
 def main() -> None:
+    precompile_templates()
     redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     redis_conn = Redis.from_url(redis_url)
-    with Connection(redis_conn):
-        worker = Worker([Queue("ownership")])
-        worker.work()
+
+    num_workers = int(os.getenv("WORKER_POOL_SIZE", "1"))
+    if num_workers > 1:
+        # worker_class matters: the default rq.Worker forks a work-horse per
+        # job, so the pool's warm interpreters would go unused.
+        WorkerPool(
+            queues=["ownership"],
+            connection=redis_conn,
+            num_workers=num_workers,
+            worker_class=SimpleWorker,
+        ).start()
+        return
+
+    # SimpleWorker skips the per-job fork, so short jobs reuse the warm
+    # interpreter (reportlab, jinja2, sqlalchemy already imported).
+    worker = SimpleWorker(
+        [Queue("ownership", connection=redis_conn)], connection=redis_conn
+    )
+    worker.work()
 
 
 if __name__ == "__main__":